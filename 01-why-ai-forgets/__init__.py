@@ -9,7 +9,8 @@ from .quick_fixes import (
     SentenceAwareChunker,
     ParagraphAwareChunker,
     MetadataPreservingChunker,
-    ChunkWithMetadata
+    ChunkWithMetadata,
+    ChunkTable
 )
 
 __all__ = [
@@ -20,5 +21,6 @@ __all__ = [
     'SentenceAwareChunker',
     'ParagraphAwareChunker',
     'MetadataPreservingChunker',
-    'ChunkWithMetadata'
+    'ChunkWithMetadata',
+    'ChunkTable'
 ]
\ No newline at end of file
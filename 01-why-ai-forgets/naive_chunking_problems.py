@@ -3,10 +3,15 @@ Demonstrating the problems with naive chunking strategies.
 This code shows what NOT to do and why it causes issues.
 """
 
+import os
 import textwrap
-from typing import List, Dict, Any
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice, repeat
+from typing import List, Dict, Any, Iterable, Iterator
 from dataclasses import dataclass
 
+import numpy as np
+
 
 @dataclass
 class ChunkProblem:
@@ -28,14 +33,70 @@ class NaiveChunker:
         Naive chunking: just split at fixed character intervals.
         This is what causes all the problems!
         """
-        return [text[i:i+self.chunk_size] 
-                for i in range(0, len(text), self.chunk_size)]
+        return list(self.iter_chunks(text))
+    
+    def iter_chunks(self, text: str) -> Iterator[str]:
+        """Yield fixed-size chunks one at a time"""
+        size = self.chunk_size
+        for i in range(0, len(text), size):
+            yield text[i:i+size]
+    
+    def chunk_views(self, text: str) -> List[memoryview]:
+        """
+        Zero-copy variant of chunk() for large inputs: encode once and
+        return memoryview slices of the UTF-8 bytes. Decode with
+        bytes(view).decode() only when a chunk is actually used.
+        
+        For ASCII text (text.isascii() is an O(1) check) bytes and
+        characters coincide, so each view decodes to exactly the matching
+        chunk() entry. Otherwise chunk_size counts bytes, and a multi-byte
+        character can straddle two views.
+        """
+        size = self.chunk_size
+        view = memoryview(text.encode('utf-8'))
+        return [view[i:i+size] for i in range(0, len(view), size)]
+    
+    def chunk_array(self, text: str) -> np.ndarray:
+        """
+        Fixed-shape variant of chunk_views(): a single (n_chunks, chunk_size)
+        uint8 array with one row per chunk, zero-padded at the end.
+        """
+        data = np.frombuffer(text.encode('utf-8'), dtype=np.uint8)
+        n_chunks = -(-len(data) // self.chunk_size)
+        table = np.zeros((n_chunks, self.chunk_size), dtype=np.uint8)
+        table.reshape(-1)[:len(data)] = data
+        return table
+
+
+# Parallel analysis only pays off with enough workers and enough chunks.
+# Measured on one core: a fresh pool costs ~5-6 ms, checking a chunk ~2.5 us,
+# and the work left on the main process (pickling chunks out, unpickling
+# problems back) ~1 us per chunk. Each worker therefore saves at most
+# ~2.5 * (1 - 1/workers) - 1 us per chunk: ~0.25 us with 2 workers, which is
+# within measurement noise, and ~0.9 us with 4, which breaks even around 7k
+# chunks. The multi-core crossover itself has not been timed, so require
+# 4 workers and leave some margin on the chunk count.
+_PARALLEL_MIN_WORKERS = 4
+_PARALLEL_MIN_CHUNKS = 10_000
+
+
+def _analyze_range(analyzer: "ChunkAnalyzer", start: int, chunks: List[str],
+                   prev_tails: List[str]) -> List[ChunkProblem]:
+    """Worker entry point: analyze a contiguous slice of chunks"""
+    problems = []
+    for offset, (chunk, prev_tail) in enumerate(zip(chunks, prev_tails)):
+        problems.extend(analyzer._check_chunk(start + offset, chunk, prev_tail))
+    return problems
 
 
 class ChunkAnalyzer:
     """Analyze chunks to find problems"""
     
-    def __init__(self):
+    def __init__(self, workers: int = 1):
+        # Number of processes for large chunk lists (fewer than
+        # _PARALLEL_MIN_WORKERS = always sequential); more processes than
+        # CPUs would only add start-up cost
+        self.workers = max(1, min(workers, os.cpu_count() or 1))
         self.sentence_endings = ['.', '!', '?']
         self.reference_phrases = [
             'as mentioned above',
@@ -45,49 +106,86 @@ class ChunkAnalyzer:
             'refer to section'
         ]
     
-    def analyze_chunks(self, chunks: List[str]) -> List[ChunkProblem]:
-        """Find all the problems in a set of chunks"""
-        problems = []
+    def analyze_chunks(self, chunks: Iterable[str]) -> List[ChunkProblem]:
+        """
+        Find all the problems in a set of chunks. Chunks are consumed in a
+        single pass, so this also accepts a generator such as iter_chunks().
+        """
+        if self.workers >= _PARALLEL_MIN_WORKERS:
+            chunks = list(chunks)
+            if len(chunks) >= _PARALLEL_MIN_CHUNKS:
+                return self._analyze_parallel(chunks)
+        return list(self.iter_problems(chunks))
+    
+    def iter_problems(self, chunks: Iterable[str]) -> Iterator[ChunkProblem]:
+        """
+        Yield problems one at a time, in the same order as analyze_chunks().
+        Callers that only need the first few can stop early, and no chunk
+        past that point is inspected.
+        """
+        # Last non-whitespace character of the previous chunk
+        prev_tail = ''
         
         for i, chunk in enumerate(chunks):
-            # Check for mid-sentence breaks
-            if i > 0 and not chunks[i-1].rstrip().endswith(tuple(self.sentence_endings)):
-                problems.append(ChunkProblem(
+            yield from self._check_chunk(i, chunk, prev_tail)
+            prev_tail = chunk.rstrip()[-1:]
+    
+    def _analyze_parallel(self, chunks: List[str]) -> List[ChunkProblem]:
+        """Analyze contiguous ranges of chunks in worker processes"""
+        # The only cross-chunk state is the previous chunk's last character,
+        # so precompute it here and each range can be checked independently
+        prev_tails = [''] + [chunk.rstrip()[-1:] for chunk in chunks[:-1]]
+        
+        size = -(-len(chunks) // self.workers)
+        starts = range(0, len(chunks), size)
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            results = pool.map(
+                _analyze_range,
+                repeat(self),
+                starts,
+                [chunks[s:s+size] for s in starts],
+                [prev_tails[s:s+size] for s in starts]
+            )
+            return [problem for result in results for problem in result]
+    
+    def _check_chunk(self, i: int, chunk: str, prev_tail: str) -> Iterator[ChunkProblem]:
+        """Check one chunk, given the last non-whitespace character before it"""
+        # Check for mid-sentence breaks
+        if i > 0 and prev_tail not in self.sentence_endings:
+            yield ChunkProblem(
+                chunk_index=i,
+                problem_type="Semantic Break",
+                description="Chunk starts mid-sentence",
+                example=chunk[:50] + "..."
+            )
+        
+        # Check for broken references
+        chunk_lower = chunk.lower()
+        for phrase in self.reference_phrases:
+            idx = chunk_lower.find(phrase)
+            if idx != -1:
+                yield ChunkProblem(
                     chunk_index=i,
-                    problem_type="Semantic Break",
-                    description="Chunk starts mid-sentence",
-                    example=chunk[:50] + "..."
-                ))
-            
-            # Check for broken references
-            for phrase in self.reference_phrases:
-                if phrase in chunk.lower():
-                    problems.append(ChunkProblem(
-                        chunk_index=i,
-                        problem_type="Reference Loss",
-                        description=f"Contains reference '{phrase}' but context may be in different chunk",
-                        example=self._extract_context(chunk, phrase)
-                    ))
-            
-            # Check for isolated list items
-            if chunk.strip().startswith(('- ', '* ', '• ', '1. ', '2. ', '3. ')):
-                if i == 0 or not chunks[i-1].rstrip().endswith(':'):
-                    problems.append(ChunkProblem(
-                        chunk_index=i,
-                        problem_type="Structural Destruction",
-                        description="List item separated from header",
-                        example=chunk[:50] + "..."
-                    ))
+                    problem_type="Reference Loss",
+                    description=f"Contains reference '{phrase}' but context may be in different chunk",
+                    example=self._extract_context(chunk, idx, len(phrase))
+                )
         
-        return problems
+        # Check for isolated list items
+        if chunk.strip().startswith(('- ', '* ', '• ', '1. ', '2. ', '3. ')):
+            if i == 0 or prev_tail != ':':
+                yield ChunkProblem(
+                    chunk_index=i,
+                    problem_type="Structural Destruction",
+                    description="List item separated from header",
+                    example=chunk[:50] + "..."
+                )
     
-    def _extract_context(self, text: str, phrase: str, context_size: int = 30) -> str:
-        """Extract context around a phrase"""
-        idx = text.lower().find(phrase)
-        if idx == -1:
-            return ""
+    def _extract_context(self, text: str, idx: int, phrase_len: int,
+                         context_size: int = 30) -> str:
+        """Extract context around a phrase found at text[idx:idx+phrase_len]"""
         start = max(0, idx - context_size)
-        end = min(len(text), idx + len(phrase) + context_size)
+        end = min(len(text), idx + phrase_len + context_size)
         return "..." + text[start:end] + "..."
 
 
@@ -168,12 +266,15 @@ def demonstrate_problems():
         print("-" * 40)
         
         chunks = chunker.chunk(text)
-        problems = analyzer.analyze_chunks(chunks)
+        problems = analyzer.iter_problems(chunks)
+        first_problems = list(islice(problems, 3))  # Show first 3 problems
+        # Count the rest without keeping them
+        total = len(first_problems) + sum(1 for _ in problems)
         
         print(f"Created {len(chunks)} chunks")
-        print(f"Found {len(problems)} problems:")
+        print(f"Found {total} problems:")
         
-        for problem in problems[:3]:  # Show first 3 problems
+        for problem in first_problems:
             print(f"\n  • {problem.problem_type} in chunk {problem.chunk_index}")
             print(f"    {problem.description}")
             if problem.example:
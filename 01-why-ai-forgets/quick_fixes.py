@@ -3,9 +3,62 @@ Quick fixes for chunking problems that you can implement today.
 These aren't perfect solutions, but they're much better than naive chunking.
 """
 
+import contextlib
+import hashlib
+import logging
+import os
+import pickle
 import re
-from typing import List, Optional, Dict, Any
-from dataclasses import dataclass
+import tempfile
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Optional, Dict, Any, Tuple, Iterator, Union, NamedTuple
+
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
+
+
+# Split patterns shared by the chunkers below, compiled once
+_SENT_RE = re.compile(r'(?<=[.!?])\s+')
+_PARA_RE = re.compile(r'\n\n+')
+
+# Part of every MetadataPreservingChunker cache key. Bump it whenever
+# ChunkWithMetadata or the chunking logic changes, so old cache files are
+# ignored instead of being loaded into the new format
+_CACHE_VERSION = 2
+
+# Below this length the regex engine beats NumPy's per-call overhead
+_VECTORIZE_MIN_CHARS = 4096
+
+# Byte lookup tables: ASCII characters matched by \s, and sentence endings
+_IS_WS = np.zeros(256, dtype=bool)
+_IS_WS[list(b' \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f')] = True
+_IS_SENT_END = np.zeros(256, dtype=bool)
+_IS_SENT_END[list(b'.!?')] = True
+
+
+def _runs(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Start and end offsets of each run of True values in mask"""
+    edges = np.diff(mask.astype(np.int8), prepend=0, append=0)
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def _sentence_separators(text: str) -> Iterator[Tuple[int, int]]:
+    """
+    Yield (start, end) of every _SENT_RE match in text. Long ASCII text is
+    scanned with vectorized byte lookups instead of the regex engine: a
+    separator is a whitespace run that directly follows '.', '!' or '?'.
+    """
+    if len(text) < _VECTORIZE_MIN_CHARS or not text.isascii():
+        yield from (match.span() for match in _SENT_RE.finditer(text))
+        return
+    data = np.frombuffer(text.encode('ascii'), dtype=np.uint8)
+    starts, ends = _runs(_IS_WS[data])
+    keep = (starts > 0) & _IS_SENT_END[data[np.maximum(starts - 1, 0)]]
+    yield from zip(starts[keep].tolist(), ends[keep].tolist())
 
 
 class NaiveChunker:
@@ -16,81 +69,253 @@ class NaiveChunker:
 
     def chunk(self, text: str) -> List[str]:
         """Naive chunking: just split at fixed character intervals"""
-        return [text[i:i+self.chunk_size]
-                for i in range(0, len(text), self.chunk_size)]
+        return list(self.iter_chunks(text))
 
+    def iter_chunks(self, text: str) -> Iterator[str]:
+        """Yield fixed-size chunks one at a time"""
+        size = self.chunk_size
+        for i in range(0, len(text), size):
+            yield text[i:i+size]
 
-@dataclass
-class ChunkWithMetadata:
-    """A chunk with additional context information"""
+
+class ChunkWithMetadata(NamedTuple):
+    """
+    A chunk with additional context information. The metadata keys are
+    fixed, so they are stored as fields rather than a per-chunk dict.
+    """
     content: str
-    metadata: Dict[str, Any]
+    doc_title: str
+    section: str
+    subsection: str
     chunk_index: int
+    total_chunks: int
+    has_list: bool
+    has_code: bool
+    word_count: int
     overlap_with_previous: Optional[str] = None
     overlap_with_next: Optional[str] = None
+    
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """The metadata fields as a dict (built on each access)"""
+        return {
+            'doc_title': self.doc_title,
+            'section': self.section,
+            'subsection': self.subsection,
+            'chunk_index': self.chunk_index,
+            'total_chunks': self.total_chunks,
+            'has_list': self.has_list,
+            'has_code': self.has_code,
+            'word_count': self.word_count
+        }
+
+
+class ChunkTable:
+    """
+    Column-oriented alternative to List[ChunkWithMetadata]: one array per
+    field instead of one object per chunk. Section titles are stored once
+    and referenced by index, and the boolean fields are packed into a
+    bitmap, so questions like "how many chunks have lists?" become single
+    NumPy calls, e.g. np.count_nonzero(table.flags & ChunkTable.HAS_LIST).
+    """
+    
+    # Bits in flags
+    HAS_LIST = 1
+    HAS_CODE = 2
+    
+    def __init__(self, doc_title: str, contents: List[str], sections: List[str],
+                 section_ids: array, subsection_ids: array,
+                 word_counts: np.ndarray, flags: np.ndarray):
+        self.doc_title = doc_title
+        self.contents = contents
+        self.sections = sections  # distinct titles, indexed by *_ids
+        self.section_ids = section_ids
+        self.subsection_ids = subsection_ids
+        self.word_counts = word_counts  # int32
+        self.flags = flags  # uint8 bitmap of HAS_LIST | HAS_CODE
+    
+    def __len__(self) -> int:
+        return len(self.contents)
+    
+    def __getitem__(self, i: int) -> ChunkWithMetadata:
+        """Build the ChunkWithMetadata for chunk i on demand"""
+        i = range(len(self.contents))[i]
+        contents = self.contents
+        return ChunkWithMetadata(
+            content=contents[i],
+            doc_title=self.doc_title,
+            section=self.sections[self.section_ids[i]],
+            subsection=self.sections[self.subsection_ids[i]],
+            chunk_index=i,
+            total_chunks=len(contents),
+            has_list=bool(self.flags[i] & self.HAS_LIST),
+            has_code=bool(self.flags[i] & self.HAS_CODE),
+            word_count=int(self.word_counts[i]),
+            overlap_with_previous=contents[i-1][-50:] if i > 0 else None,
+            overlap_with_next=contents[i+1][:50] if i < len(contents) - 1 else None
+        )
 
 
 class OverlapChunker:
     """Chunker with overlap to preserve context at boundaries"""
     
     def __init__(self, chunk_size: int = 1000, overlap: int = 100):
+        if not 0 <= overlap < chunk_size:
+            raise ValueError(
+                f"overlap must be >= 0 and smaller than chunk_size "
+                f"(got overlap={overlap}, chunk_size={chunk_size})"
+            )
         self.chunk_size = chunk_size
         self.overlap = overlap
     
     def chunk(self, text: str) -> List[str]:
         """Create chunks with overlap"""
-        chunks = []
-        start = 0
-        
-        while start < len(text):
-            end = min(start + self.chunk_size, len(text))
-            chunks.append(text[start:end])
-            start = end - self.overlap  # Back up for overlap
-            
-            # Avoid infinite loop on small texts
-            if end == len(text):
-                break
+        return list(self.iter_chunks(text))
+    
+    def iter_chunks(self, text: str) -> Iterator[str]:
+        """Yield overlapping chunks one at a time"""
+        for start, end in self._windows(len(text)):
+            yield text[start:end]
+    
+    def chunk_views(self, text: str) -> List[memoryview]:
+        """
+        Encode once and return overlapping memoryview windows of the UTF-8
+        bytes, so the overlap region is never copied. For ASCII text the
+        windows decode to exactly what chunk() returns; otherwise
+        chunk_size and overlap count bytes.
+        """
+        view = memoryview(text.encode('utf-8'))
+        return [view[start:end] for start, end in self._windows(len(view))]
+    
+    def chunk_tokens(self, text: str, tokenizer) -> Iterator[Tuple[int, int, np.ndarray]]:
+        """
+        Tokenize once and yield (start, end, token_ids) windows over the
+        shared token array. Windows are NumPy views, so the overlapping
+        region is neither tokenized nor stored twice.
         
-        return chunks
+        Here chunk_size and overlap count tokens. Any tokenizer with an
+        encode(text) -> List[int] method works (e.g. tiktoken).
+        """
+        ids = np.asarray(tokenizer.encode(text), dtype=np.int32)
+        for start, end in self._windows(len(ids)):
+            yield start, end, ids[start:end]
+    
+    def _windows(self, n: int) -> Iterator[Tuple[int, int]]:
+        """Yield (start, end) bounds of each overlapping window over n items"""
+        # Read the settings once; the loop body only touches locals
+        size, overlap = self.chunk_size, self.overlap
+        # Stop once a window reaches the end: any later start would only
+        # produce a window already contained in the previous one
+        stop = max(n - overlap, 1) if n else 0
+        for start in range(0, stop, size - overlap):
+            end = start + size
+            yield start, (end if end < n else n)
 
 
 class SentenceAwareChunker:
     """Chunker that respects sentence boundaries"""
     
-    def __init__(self, target_size: int = 1000, max_size: int = 1200):
+    def __init__(self, target_size: int = 1000, max_size: int = 1200,
+                 backend: str = "python"):
         self.target_size = target_size
         self.max_size = max_size
+        self.backend = backend
+        
+        # Optional Rust backend (pip install semantic-text-splitter)
+        if backend == "rust":
+            from semantic_text_splitter import TextSplitter
+            # The Python path accepts target_size > max_size (max_size
+            # wins); TextSplitter requires an ordered range, so clamp it
+            self._splitter = TextSplitter((min(target_size, max_size), max_size))
+        elif backend == "python":
+            self._splitter = None
+        else:
+            raise ValueError(f"Unknown backend: {backend!r}")
     
     def chunk(self, text: str) -> List[str]:
         """Split text at sentence boundaries"""
-        # Simple sentence splitting (can be improved with NLTK or spaCy)
-        sentences = re.split(r'(?<=[.!?])\s+', text)
+        if self._splitter is not None:
+            return self._splitter.chunks(text)
+        return list(self.iter_chunks(text))
+    
+    def iter_chunks(self, text: str) -> Iterator[str]:
+        """Yield sentence-aligned chunks one at a time"""
+        for chunk, _, _ in self.iter_chunks_with_offsets(text):
+            yield chunk
+    
+    def chunk_with_offsets(self, text: str) -> List[Tuple[str, int, int]]:
+        """
+        Split text at sentence boundaries, keeping track of where each chunk
+        came from. Returns (chunk, start, end) tuples where text[start:end]
+        spans the sentences that make up the chunk.
+        """
+        return list(self.iter_chunks_with_offsets(text))
+    
+    def iter_chunks_with_offsets(self, text: str) -> Iterator[Tuple[str, int, int]]:
+        """Yield (chunk, start, end) tuples one at a time"""
+        if self._splitter is not None:
+            for start, chunk in self._splitter.chunk_indices(text):
+                yield chunk, start, start + len(chunk)
+            return
         
-        chunks = []
-        current_chunk = ""
+        # Collect sentences in a list and join once per chunk; buf_len is
+        # what len(" ".join(buf)) would be, without building the string
+        buf: List[str] = []
+        buf_len = 0
+        chunk_start = chunk_end = 0
         
-        for sentence in sentences:
+        for sentence, start, end in self._iter_sentences(text):
             # If adding this sentence would exceed max size, start new chunk
-            if len(current_chunk) + len(sentence) > self.max_size and current_chunk:
-                chunks.append(current_chunk.strip())
-                current_chunk = sentence
+            if buf_len + len(sentence) > self.max_size and buf_len:
+                yield self._emit(text, " ".join(buf), chunk_start, chunk_end)
+                buf = [sentence]
+                buf_len = len(sentence)
+                chunk_start = start
             # If current chunk hasn't reached target size, keep adding
-            elif len(current_chunk) + len(sentence) <= self.target_size:
-                current_chunk += " " + sentence if current_chunk else sentence
+            elif buf_len + len(sentence) <= self.target_size:
+                if buf_len:
+                    buf.append(sentence)
+                    buf_len += 1 + len(sentence)
+                else:
+                    buf = [sentence]
+                    buf_len = len(sentence)
+                    chunk_start = start
             # If we're between target and max size, make a decision
             else:
                 # Add if it keeps us under max, otherwise start new chunk
-                if len(current_chunk) + len(sentence) <= self.max_size:
-                    current_chunk += " " + sentence
+                if buf_len + len(sentence) <= self.max_size:
+                    if not buf_len:
+                        chunk_start = start
+                    buf.append(sentence)
+                    buf_len += 1 + len(sentence)
                 else:
-                    if current_chunk:
-                        chunks.append(current_chunk.strip())
-                    current_chunk = sentence
-        
-        if current_chunk:
-            chunks.append(current_chunk.strip())
+                    if buf_len:
+                        yield self._emit(text, " ".join(buf), chunk_start, chunk_end)
+                    buf = [sentence]
+                    buf_len = len(sentence)
+                    chunk_start = start
+            chunk_end = end
         
-        return chunks
+        if buf_len:
+            yield self._emit(text, " ".join(buf), chunk_start, chunk_end)
+    
+    def _iter_sentences(self, text: str) -> Iterator[Tuple[str, int, int]]:
+        """Yield (sentence, start, end) for each sentence in text"""
+        # Simple sentence splitting (can be improved with NLTK or spaCy)
+        pos = 0
+        for sep_start, sep_end in _sentence_separators(text):
+            yield text[pos:sep_start], pos, sep_start
+            pos = sep_end
+        yield text[pos:], pos, len(text)
+    
+    @staticmethod
+    def _emit(text: str, chunk: str, start: int, end: int) -> Tuple[str, int, int]:
+        """Strip a finished chunk and trim its span to the same boundaries"""
+        while start < end and text[start].isspace():
+            start += 1
+        while end > start and text[end - 1].isspace():
+            end -= 1
+        return chunk.strip(), start, end
 
 
 class ParagraphAwareChunker:
@@ -98,14 +323,22 @@ class ParagraphAwareChunker:
     
     def __init__(self, target_size: int = 1000):
         self.target_size = target_size
+        # Fallback for paragraphs that are too large on their own
+        self._sent_chunker = SentenceAwareChunker(target_size)
     
     def chunk(self, text: str) -> List[str]:
         """Split text at paragraph boundaries"""
+        return list(self.iter_chunks(text))
+    
+    def iter_chunks(self, text: str) -> Iterator[str]:
+        """Yield paragraph-aligned chunks one at a time"""
         # Split by double newlines (paragraphs)
-        paragraphs = re.split(r'\n\n+', text)
+        paragraphs = _PARA_RE.split(text)
         
-        chunks = []
-        current_chunk = ""
+        # Collect pieces in a list and join once per chunk; buf_len is
+        # what len("\n\n".join(buf)) would be, without building the string
+        buf: List[str] = []
+        buf_len = 0
         
         for paragraph in paragraphs:
             paragraph = paragraph.strip()
@@ -114,41 +347,182 @@ class ParagraphAwareChunker:
             
             # If single paragraph is too large, fall back to sentence splitting
             if len(paragraph) > self.target_size:
-                sentence_chunker = SentenceAwareChunker(self.target_size)
-                para_chunks = sentence_chunker.chunk(paragraph)
-                for pc in para_chunks:
-                    if len(current_chunk) + len(pc) <= self.target_size:
-                        current_chunk += "\n\n" + pc if current_chunk else pc
-                    else:
-                        if current_chunk:
-                            chunks.append(current_chunk)
-                        current_chunk = pc
+                pieces = self._sent_chunker.iter_chunks(paragraph)
             # Normal case: add whole paragraph
-            elif len(current_chunk) + len(paragraph) <= self.target_size:
-                current_chunk += "\n\n" + paragraph if current_chunk else paragraph
             else:
-                if current_chunk:
-                    chunks.append(current_chunk)
-                current_chunk = paragraph
-        
-        if current_chunk:
-            chunks.append(current_chunk)
+                pieces = (paragraph,)
+            
+            for piece in pieces:
+                if buf_len + len(piece) <= self.target_size:
+                    if buf:
+                        buf.append(piece)
+                        buf_len += 2 + len(piece)
+                    else:
+                        buf = [piece]
+                        buf_len = len(piece)
+                else:
+                    if buf:
+                        yield "\n\n".join(buf)
+                    buf = [piece]
+                    buf_len = len(piece)
         
-        return chunks
+        if buf:
+            yield "\n\n".join(buf)
 
 
 class MetadataPreservingChunker:
     """Chunker that preserves document structure metadata"""
     
-    def __init__(self, chunk_size: int = 1000):
+    def __init__(self, chunk_size: int = 1000,
+                 cache_dir: Optional[Union[str, Path]] = None,
+                 cache_size: int = 0):
         self.chunk_size = chunk_size
+        # Results are cached by content hash: every document on disk if
+        # cache_dir is set, and the most recent cache_size documents in memory
+        # (0 = no in-memory cache)
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, List[ChunkWithMetadata]]" = OrderedDict()
         self.section_pattern = re.compile(r'^#+\s+(.+)$', re.MULTILINE)
         self.list_pattern = re.compile(r'^[\s]*[-*•]\s+', re.MULTILINE)
+        self._sent_chunker = SentenceAwareChunker(chunk_size)
     
     def chunk_with_metadata(self, text: str, doc_title: str = "") -> List[ChunkWithMetadata]:
-        """Create chunks with metadata about document structure"""
-        chunks_with_metadata = []
+        """
+        Create chunks with metadata about document structure. Re-chunking
+        a document that was seen before is served from the cache.
+        """
+        key = self._cache_key(text, doc_title)
+        
+        chunks = self._cache.get(key)
+        if chunks is not None:
+            self._cache.move_to_end(key)
+            return list(chunks)
+        
+        path = self.cache_dir / f"{key}.pkl" if self.cache_dir is not None else None
+        chunks = self._load_cached(path) if path is not None else None
+        if chunks is None:
+            chunks = list(self.iter_chunks_with_metadata(text, doc_title))
+            if path is not None:
+                self._store_cached(path, chunks)
+        
+        if self.cache_size > 0:
+            self._cache[key] = chunks
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return list(chunks)
+    
+    @staticmethod
+    def _load_cached(path: Path) -> Optional[List[ChunkWithMetadata]]:
+        """Read a cache file, treating a missing or unreadable one as a miss"""
+        try:
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, TypeError,
+                AttributeError, ImportError, ValueError):
+            # Missing, unreadable, truncated, corrupt, or written for an
+            # older ChunkWithMetadata
+            return None
+    
+    def _store_cached(self, path: Path, chunks: List[ChunkWithMetadata]) -> None:
+        """
+        Write a cache file atomically, so readers never see a partial file.
+        A failed write (read-only directory, full disk) is logged and skipped.
+        """
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        except OSError as e:
+            logger.warning("Not caching chunks in %s: %s", self.cache_dir, e)
+            return
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(chunks, f, protocol=5)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_path)
+            logger.warning("Not caching chunks in %s: %s", path, e)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_path)
+            raise
+    
+    def _cache_key(self, text: str, doc_title: str) -> str:
+        """Hash of everything that determines the chunking result"""
+        params = f"{_CACHE_VERSION}:{self.chunk_size}:{len(doc_title)}:{doc_title}"
+        h = hashlib.blake2b(digest_size=16)
+        h.update(params.encode('utf-8', 'surrogatepass'))
+        h.update(text.encode('utf-8', 'surrogatepass'))
+        return h.hexdigest()
+    
+    def iter_chunks_with_metadata(self, text: str,
+                                  doc_title: str = "") -> Iterator[ChunkWithMetadata]:
+        """Yield chunks with metadata one at a time"""
+        # Use sentence-aware chunking as base. The chunk strings are kept
+        # (total_chunks needs the count up front); metadata is built lazily
+        spans = self._sent_chunker.chunk_with_offsets(text)
+        chunks = [chunk for chunk, _, _ in spans]
+        
+        for i, (section, subsection) in enumerate(self._iter_sections(text, spans)):
+            chunk = chunks[i]
+            
+            # Add overlap information
+            overlap_prev = chunks[i-1][-50:] if i > 0 else None
+            overlap_next = chunks[i+1][:50] if i < len(chunks) - 1 else None
+            
+            yield ChunkWithMetadata(
+                content=chunk,
+                doc_title=doc_title,
+                section=section,
+                subsection=subsection,
+                chunk_index=i,
+                total_chunks=len(chunks),
+                # Detect if chunk contains a list or code
+                has_list=bool(self.list_pattern.search(chunk)),
+                has_code='```' in chunk or 'def ' in chunk or 'function ' in chunk,
+                word_count=len(chunk.split()),
+                overlap_with_previous=overlap_prev,
+                overlap_with_next=overlap_next
+            )
+    
+    def chunk_with_metadata_table(self, text: str, doc_title: str = "") -> ChunkTable:
+        """
+        Same chunks as chunk_with_metadata(), built directly into columns
+        instead of one ChunkWithMetadata per chunk
+        """
+        spans = self._sent_chunker.chunk_with_offsets(text)
+        contents = [chunk for chunk, _, _ in spans]
+        
+        # Each distinct section title is stored once; chunks refer to it by index
+        title_ids: Dict[str, int] = {}
+        section_ids = array('i')
+        subsection_ids = array('i')
+        word_counts = []
+        flags = []
+        
+        for chunk, (section, subsection) in zip(contents, self._iter_sections(text, spans)):
+            section_ids.append(title_ids.setdefault(section, len(title_ids)))
+            subsection_ids.append(title_ids.setdefault(subsection, len(title_ids)))
+            word_counts.append(len(chunk.split()))
+            flags.append(
+                (ChunkTable.HAS_LIST if self.list_pattern.search(chunk) else 0)
+                | (ChunkTable.HAS_CODE if '```' in chunk or 'def ' in chunk or 'function ' in chunk else 0)
+            )
         
+        return ChunkTable(
+            doc_title=doc_title,
+            contents=contents,
+            sections=list(title_ids),
+            section_ids=section_ids,
+            subsection_ids=subsection_ids,
+            word_counts=np.array(word_counts, dtype=np.int32),
+            flags=np.array(flags, dtype=np.uint8)
+        )
+    
+    def _iter_sections(self, text: str,
+                       spans: List[Tuple[str, int, int]]) -> Iterator[Tuple[str, str]]:
+        """Yield the (section, subsection) that each chunk in spans falls under"""
         # Find all section headers
         sections = []
         for match in self.section_pattern.finditer(text):
@@ -158,58 +532,23 @@ class MetadataPreservingChunker:
                 'level': len(match.group(0).split()[0])  # Count # symbols
             })
         
-        # Use sentence-aware chunking as base
-        sentence_chunker = SentenceAwareChunker(self.chunk_size)
-        chunks = sentence_chunker.chunk(text)
-        
-        current_position = 0
+        # Sections come out of finditer in document order, so a single
+        # cursor is enough to track the section each chunk falls under
+        si = 0
         current_section = ""
         current_subsection = ""
         
-        for i, chunk in enumerate(chunks):
-            # Find which section this chunk belongs to
-            chunk_start = text.find(chunk, current_position)
-            current_position = chunk_start + len(chunk)
-            
+        for _, chunk_start, _ in spans:
             # Update section context
-            for section in sections:
-                if section['start'] <= chunk_start:
-                    if section['level'] == 1:
-                        current_section = section['title']
-                    elif section['level'] == 2:
-                        current_subsection = section['title']
-            
-            # Detect if chunk contains a list
-            has_list = bool(self.list_pattern.search(chunk))
-            
-            # Detect if chunk has code
-            has_code = '```' in chunk or 'def ' in chunk or 'function ' in chunk
+            while si < len(sections) and sections[si]['start'] <= chunk_start:
+                section = sections[si]
+                if section['level'] == 1:
+                    current_section = section['title']
+                elif section['level'] == 2:
+                    current_subsection = section['title']
+                si += 1
             
-            # Create metadata
-            metadata = {
-                'doc_title': doc_title,
-                'section': current_section,
-                'subsection': current_subsection,
-                'chunk_index': i,
-                'total_chunks': len(chunks),
-                'has_list': has_list,
-                'has_code': has_code,
-                'word_count': len(chunk.split())
-            }
-            
-            # Add overlap information
-            overlap_prev = chunks[i-1][-50:] if i > 0 else None
-            overlap_next = chunks[i+1][:50] if i < len(chunks) - 1 else None
-            
-            chunks_with_metadata.append(ChunkWithMetadata(
-                content=chunk,
-                metadata=metadata,
-                chunk_index=i,
-                overlap_with_previous=overlap_prev,
-                overlap_with_next=overlap_next
-            ))
-        
-        return chunks_with_metadata
+            yield current_section, current_subsection
 
 
 def demonstrate_improvements():
@@ -299,9 +638,9 @@ def demonstrate_improvements():
     print("Each chunk knows its context:")
     for chunk in metadata_chunks[:3]:
         print(f"\n  Chunk {chunk.chunk_index}:")
-        print(f"    Section: {chunk.metadata['section']}")
-        print(f"    Has list: {chunk.metadata['has_list']}")
-        print(f"    Word count: {chunk.metadata['word_count']}")
+        print(f"    Section: {chunk.section}")
+        print(f"    Has list: {chunk.has_list}")
+        print(f"    Word count: {chunk.word_count}")
         print(f"    Content preview: {chunk.content[:60]}...")
 
 